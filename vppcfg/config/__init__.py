@@ -80,6 +80,11 @@ class Validator:
     of built-in validators, and user-added validators (see the add_validator() method).
     """
 
+    ## Compiled yamale schemas, keyed on their absolute filename. Compiling a
+    ## schema is by far the most expensive part of syntax validation, so share
+    ## the result between Validator instances in the same process.
+    _schema_cache = {}
+
     def __init__(self, schema):
         self.logger = logging.getLogger("vppcfg.config")
         self.logger.addHandler(logging.NullHandler())
@@ -104,8 +109,6 @@ class Validator:
         if not yaml:
             return ret_retval, ret_msgs
 
-        _validators = validators.DefaultValidators.copy()
-        _validators[IPInterfaceWithPrefixLength.tag] = IPInterfaceWithPrefixLength
         if self.schema:
             fname = self.schema
             self.logger.debug(f"Validating against --schema {fname}")
@@ -121,7 +124,7 @@ class Validator:
             return False, ret_msgs
 
         try:
-            schema = yamale.make_schema(fname, validators=_validators)
+            schema = self._compile_schema(fname)
             data = yamale.make_data(content=str(yaml))
             yamale.validate(schema, data)
             self.logger.debug("Schema correctly validated by yamale")
@@ -145,6 +148,19 @@ class Validator:
             self.logger.debug("Semantics correctly validated")
         return ret_retval, ret_msgs
 
+    @classmethod
+    def _compile_schema(cls, fname):
+        """Return the compiled yamale schema for the file 'fname', compiling it
+        on first use and serving it from a per-process cache afterwards."""
+        fname = os.path.abspath(fname)
+        if fname not in cls._schema_cache:
+            _validators = validators.DefaultValidators.copy()
+            _validators[IPInterfaceWithPrefixLength.tag] = IPInterfaceWithPrefixLength
+            cls._schema_cache[fname] = yamale.make_schema(
+                fname, validators=_validators
+            )
+        return cls._schema_cache[fname]
+
     def valid_config(self, yaml):
         """Validate the given YAML configuration in 'yaml' against syntax
         validation given in the yamale 'schema', and all semantic configs.
@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2022 Pim van Pelt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -*- coding: utf-8 -*-
+"""A structure-of-arrays view on the 'interfaces' scope of a vppcfg YAML
+configuration. PyYAML builds a dict-of-dicts tree, which is convenient to
+validate but costly to scan repeatedly: every attribute is a pointer chase
+and every name lookup a dict probe. An InterfaceList carries one parallel
+array per attribute instead, so passes over large configurations (thousands
+of sub-interfaces) touch contiguous storage and hash each name only once."""
+import array
+
+
+class InterfaceList:
+    """Parallel per-interface arrays, built once from a YAML configuration by
+    from_config(). Index i describes the i'th (sub-)interface in config order;
+    'name_index' maps an interface name back to i. Sub-interfaces are listed
+    under the same dotted names that interface.get_interfaces() emits, eg.
+    GigabitEthernet1/0/0.100"""
+
+    __slots__ = ("names", "name_index", "mtus", "lcps", "addresses", "num_tags")
+
+    def __init__(self):
+        self.names = []
+        self.name_index = {}
+        self.mtus = array.array("I")
+        self.lcps = []
+        self.addresses = []
+        self.num_tags = array.array("B")
+
+    def add(self, ifname, iface, num_tags=0):
+        """Append the interface 'ifname' with config dict 'iface' (which may
+        be None for bare sub-interfaces) and return its index"""
+        idx = len(self.names)
+        self.names.append(ifname)
+        self.name_index[ifname] = idx
+        if not iface:
+            iface = {}
+        self.mtus.append(iface.get("mtu", 0))
+        self.lcps.append(iface.get("lcp", None))
+        self.addresses.append(iface.get("addresses", []))
+        self.num_tags.append(num_tags)
+        return idx
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, ifname):
+        return ifname in self.name_index
+
+
+def from_config(yaml):
+    """Return an InterfaceList enumerating all interfaces and sub-interfaces
+    in the 'interfaces' scope of the given YAML configuration, in one pass."""
+    ret = InterfaceList()
+    if not yaml or not "interfaces" in yaml:
+        return ret
+    for ifname, iface in yaml["interfaces"].items():
+        ret.add(ifname, iface)
+        if not iface or not "sub-interfaces" in iface:
+            continue
+        for subid, sub_iface in iface["sub-interfaces"].items():
+            num_tags = 1
+            if sub_iface and "encapsulation" in sub_iface:
+                if "inner-dot1q" in sub_iface["encapsulation"]:
+                    num_tags = 2
+            ret.add(f"{ifname}.{int(subid)}", sub_iface, num_tags=num_tags)
+    return ret
@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2022 Pim van Pelt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -*- coding: utf-8 -*-
+""" Unit tests for the structure-of-arrays interface view """
+import unittest
+import yaml
+from . import interface
+from . import soa
+from .unittestyaml import UnitTestYaml
+
+
+class TestSOAMethods(unittest.TestCase):
+    def setUp(self):
+        with UnitTestYaml("test_interface.yaml") as f:
+            self.cfg = yaml.load(f, Loader=yaml.FullLoader)
+
+    def test_matches_get_interfaces(self):
+        ifl = soa.from_config(self.cfg)
+        self.assertEqual(interface.get_interfaces(self.cfg), ifl.names)
+        self.assertEqual(len(interface.get_interfaces(self.cfg)), len(ifl))
+
+    def test_contains(self):
+        ifl = soa.from_config(self.cfg)
+        self.assertIn("GigabitEthernet1/0/1", ifl)
+        self.assertIn("GigabitEthernet1/0/1.100", ifl)
+        self.assertNotIn("GigabitEthernet1/0/1.999", ifl)
+        self.assertNotIn("notexist", ifl)
+
+    def test_attributes(self):
+        ifl = soa.from_config(self.cfg)
+        idx = ifl.name_index["GigabitEthernet1/0/1"]
+        self.assertEqual(ifl.mtus[idx], 9216)
+        self.assertEqual(ifl.lcps[idx], "e1")
+        self.assertEqual(ifl.num_tags[idx], 0)
+        self.assertEqual(
+            ifl.addresses[idx], ["192.0.2.1/30", "2001:db8:1::1/64"]
+        )
+
+        idx = ifl.name_index["GigabitEthernet1/0/1.101"]
+        self.assertEqual(ifl.mtus[idx], 0)
+        self.assertEqual(ifl.lcps[idx], "e1.100")
+        self.assertEqual(ifl.num_tags[idx], 1)
+
+    def test_empty(self):
+        ifl = soa.from_config({})
+        self.assertEqual(0, len(ifl))
+        self.assertNotIn("GigabitEthernet1/0/1", ifl)
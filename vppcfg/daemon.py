@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2022 Pim van Pelt
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at:
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# -*- coding: utf-8 -*-
+"""vppcfg 'serve' mode: a long-lived vppcfg process listening on a Unix
+domain socket, amortizing the per-invocation constant costs (interpreter
+startup, module imports, schema compilation, VPP API JSON parsing) across
+many invocations, for orchestrators that call vppcfg in tight loops.
+
+A client connects, sends one vppcfg argument vector (one argument per line,
+terminated by an empty line or EOF), and receives the command's output
+followed by a final 'vppcfg-exit: <code>' line, eg:
+
+    printf 'check\\n-c\\nexample.yaml\\n\\n' | nc -U /run/vppcfg.sock
+
+Each request runs in a forked child with its stdout/stderr pointed at the
+connection, so requests reuse the warmed-up parent but cannot leak state
+into each other."""
+import logging
+import os
+import socket
+import sys
+
+## How long (in seconds) a connected client gets to send its argument vector
+## and to accept our replies, before the daemon gives up on it and serves the
+## next one. The per-request child is not subject to this timeout.
+CLIENT_TIMEOUT = 30.0
+
+
+def _warmup(logger):
+    """Pay the invariant startup costs once in the daemon, so forked request
+    handlers inherit the imported modules and warm caches."""
+    # pylint: disable=import-outside-toplevel,unused-import
+    import yaml  # noqa: F401
+    from vppcfg.config import Validator
+
+    schema_fname = os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "schema.yaml")
+    )
+    if os.path.isfile(schema_fname):
+        Validator._compile_schema(schema_fname)  # pylint: disable=protected-access
+
+    try:
+        from vppcfg.vpp.reconciler import Reconciler  # noqa: F401
+    except ImportError as err:
+        logger.warning(f"VPP API modules not available: {err}")
+
+
+def _read_argv(conn):
+    """Read one argument vector off the connection: one argument per line,
+    terminated by an empty line or EOF. Returns a list of strings."""
+    data = b""
+    while b"\n\n" not in data:
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return [line for line in data.decode("utf-8").split("\n") if line]
+
+
+def _handle_request(conn, argv):
+    """Run one vppcfg invocation for 'argv' in a forked child, with the
+    child's stdout/stderr wired to the connection, and report its exit code
+    back over the connection when it completes."""
+    pid = os.fork()
+    if pid == 0:
+        status = 125
+        try:
+            os.dup2(conn.fileno(), sys.stdout.fileno())
+            os.dup2(conn.fileno(), sys.stderr.fileno())
+            sys.argv = ["vppcfg"] + argv
+            # pylint: disable=import-outside-toplevel
+            from vppcfg.vppcfg import main
+
+            try:
+                main()
+                status = 0
+            except SystemExit as exc:
+                status = exc.code if isinstance(exc.code, int) else 0
+        finally:
+            os._exit(status)  # pylint: disable=protected-access
+
+    _, wait_status = os.waitpid(pid, 0)
+    code = os.waitstatus_to_exitcode(wait_status)
+    try:
+        conn.sendall(f"vppcfg-exit: {code}\n".encode("utf-8"))
+    except BrokenPipeError:
+        ## The client went away without reading our answer; its loss.
+        pass
+    return code
+
+
+def serve(socket_path):
+    """Listen on the Unix domain socket 'socket_path' and handle vppcfg
+    requests until interrupted. Returns the exit code for the daemon."""
+    logger = logging.getLogger("vppcfg.daemon")
+    logger.addHandler(logging.NullHandler())
+
+    _warmup(logger)
+
+    try:
+        os.unlink(socket_path)
+    except OSError:
+        pass
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(socket_path)
+    except OSError as err:
+        logger.error(f"Could not bind daemon socket {socket_path}: {err}")
+        return 1
+    sock.listen(8)
+    logger.info(f"Serving vppcfg requests on {socket_path}")
+
+    try:
+        while True:
+            conn, _addr = sock.accept()
+            try:
+                ## A client that connects and then goes quiet must not wedge
+                ## the daemon: socket.timeout is an OSError, so a stalled
+                ## recv()/sendall() lands in the handler below.
+                conn.settimeout(CLIENT_TIMEOUT)
+                argv = _read_argv(conn)
+                ## Select the subcommand the way main() does (the first
+                ## argument not starting with '-'), and refuse to recurse
+                ## into serve regardless of preceding flags.
+                command = next(
+                    (arg for arg in argv if not arg.startswith("-")), None
+                )
+                if not argv or command == "serve":
+                    conn.sendall(b"vppcfg-exit: 2\n")
+                    continue
+                _handle_request(conn, argv)
+            except (OSError, UnicodeDecodeError) as err:
+                ## A misbehaving client (closing early, sending garbage) must
+                ## not take down the daemon; log it and serve the next one.
+                logger.warning(f"Client request failed: {err}")
+            finally:
+                conn.close()
+    except KeyboardInterrupt:
+        logger.info("Interrupted, shutting down")
+    finally:
+        sock.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+    return 0
@@ -41,18 +41,17 @@ class Dumper(VPPApi):
 
     def write(self, outfile):
         """Emit the configuration to either stdout (outfile=='-') or a filename"""
+        config = self.cache_to_config()
+
+        ## Render the whole YAML document and emit it with a single write
+        contents = (yaml.dump(config) + "\n").encode("utf-8")
         if outfile and outfile == "-":
-            file = sys.stdout
+            sys.stdout.buffer.write(contents)
+            sys.stdout.buffer.flush()
             outfile = "(stdout)"
         else:
-            file = open(outfile, "w", encoding="utf-8")
-
-        config = self.cache_to_config()
-
-        print(yaml.dump(config), file=file)
-
-        if file is not sys.stdout:
-            file.close()
+            with open(outfile, "wb") as file:
+                file.write(contents)
         self.logger.info(f"Wrote YAML config to {outfile}")
 
     def cache_to_config(self):
@@ -25,6 +25,7 @@ from vppcfg.config import bondethernet
 from vppcfg.config import bridgedomain
 from vppcfg.config import vxlan_tunnel
 from vppcfg.config import lcp
+from vppcfg.config import soa
 from vppcfg.config import tap
 from .vppapi import VPPApi
 
@@ -36,7 +37,12 @@ class Reconciler:
     are not meant to be in the dataplane, or are in the dataplane but are not of the
     correct create-time attributes; then it creates objects that are in the configuration
     but not yet in the dataplane; and finally it syncs the configuration attributes of
-    objects that can be changed at runtime."""
+    objects that can be changed at runtime.
+
+    The three phases must run sequentially and cannot be parallelized: prune()
+    removes objects from the VPP config cache (see cache_remove_interface() and
+    friends), and create() and sync() plan against that updated cache to decide
+    what is still missing or out of sync."""
 
     def __init__(
         self,
@@ -85,6 +91,32 @@ class Reconciler:
                 ret = False
         return ret
 
+    def preflight(self):
+        """Run the pre-reconciliation checks in a single pass over the config
+        and the VPP interface cache, returning a tuple of three booleans:
+        whether all config PHYs exist in VPP, whether all VPP PHYs exist in
+        the config, and whether LCPs (if any are configured) can be created.
+        This fuses phys_exist_in_vpp(), phys_exist_in_config() and
+        lcps_exist_with_lcp_enabled() so large dataplanes are walked once."""
+        ret_phys_in_vpp = True
+        ret_phys_in_config = True
+
+        cfg_ifnames = soa.from_config(self.cfg)
+        for ifname in interface.get_phys(self.cfg):
+            if not ifname in self.vpp.cache["interface_names"]:
+                self.logger.warning(f"Interface {ifname} does not exist in VPP")
+                ret_phys_in_vpp = False
+        for ifname in self.vpp.get_phys():
+            if not ifname in cfg_ifnames:
+                self.logger.warning(f"Interface {ifname} does not exist in the config")
+                ret_phys_in_config = False
+
+        ret_lcps = True
+        if lcp.get_lcps(self.cfg):
+            ret_lcps = self.vpp.lcp_enabled
+
+        return ret_phys_in_vpp, ret_phys_in_config, ret_lcps
+
     def prune(self):
         """Remove all objects from VPP that do not occur in the config. For an indepth explanation
         of how and why this particular pruning order is chosen, see README.md section on
@@ -1405,15 +1437,17 @@ class Reconciler:
                 "comment { vppcfg: Planning failed, be careful with this output! }"
             )
 
-        # Emit the output list to stdout or a file
+        # Assemble the output into one buffer and emit it to stdout or a file
+        # with a single write, rather than a syscall per CLI line
+        contents = b""
+        if len(output) > 0:
+            contents = ("\n".join(output) + "\n").encode("utf-8")
         if outfile and outfile == "-":
-            file = sys.stdout
+            sys.stdout.buffer.write(contents)
+            sys.stdout.buffer.flush()
             outfile = "(stdout)"
         else:
-            file = open(outfile, "w", encoding="utf-8")
-        if len(output) > 0:
-            print("\n".join(output), file=file)
-        if file is not sys.stdout:
-            file.close()
+            with open(outfile, "wb") as file:
+                file.write(contents)
 
         self.logger.info(f"Wrote {len(output)} lines to {outfile}")
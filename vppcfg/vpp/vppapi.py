@@ -21,9 +21,29 @@ derived classes VPPApiDumper() and VPPApiApplier()
 import os
 import logging
 import time
+import functools
 from vpp_papi import VPPApiClient, VPPApiJSONFiles, MACAddress
 
 
+@functools.lru_cache(maxsize=4)
+def _load_vpp_messages(vpp_json_dir, _json_dir_mtime):
+    """Enumerate all VPPMessage signatures from the JSON API files found in
+    'vpp_json_dir', and give their API namedtuples defaults so creating
+    instances can set only those fields which are relevant.
+
+    Parsing dozens of JSON files is expensive and their contents are invariant
+    within a process, so the result is cached per directory; the directory
+    mtime is part of the cache key to catch an upgraded API underneath us."""
+    vpp_jsonfiles = VPPApiJSONFiles.find_api_files(api_dir=vpp_json_dir)
+    vpp_messages = {}
+    for json_filename in vpp_jsonfiles:
+        with open(json_filename, "r", encoding="utf-8") as file_handle:
+            for name, msg in VPPApiJSONFiles.process_json_file(file_handle)[0].items():
+                msg.tuple.__new__.__defaults__ = (None,) * len(msg.tuple._fields)
+                vpp_messages[name] = msg
+    return vpp_jsonfiles, vpp_messages
+
+
 class VPPApi:
     """The VPPApi class is a base class that abstracts the vpp_papi."""
 
@@ -52,22 +72,18 @@ class VPPApi:
         elif not os.path.isdir(self.vpp_json_dir):
             self.logger.error(f"VPP API JSON directory not found: {self.vpp_json_dir}")
 
-        # Construct a list of all the JSON API files
-        self.vpp_jsonfiles = VPPApiJSONFiles.find_api_files(api_dir=self.vpp_json_dir)
+        # Construct the list of JSON API files and their message signatures,
+        # (re)using the per-directory cache.
+        try:
+            json_dir_mtime = os.path.getmtime(self.vpp_json_dir)
+        except (OSError, TypeError):
+            json_dir_mtime = None
+        self.vpp_jsonfiles, self.vpp_messages = _load_vpp_messages(
+            self.vpp_json_dir, json_dir_mtime
+        )
         if not self.vpp_jsonfiles:
             self.logger.error("No JSON API files found")
 
-        # Enumerate all VPPMessage signatures from the JSON API files, and give their
-        # API namedtuple defaults so creating instances can set only those fields which
-        # are relevant.
-        for json_filename in self.vpp_jsonfiles:
-            with open(json_filename, "r", encoding="utf-8") as file_handle:
-                for name, msg in VPPApiJSONFiles.process_json_file(file_handle)[
-                    0
-                ].items():
-                    msg.tuple.__new__.__defaults__ = (None,) * len(msg.tuple._fields)
-                    self.vpp_messages[name] = msg
-
     def connect(self, retries=30):
         """Connect to the VPP Dataplane, if we're not already connected"""
         if self.connected:
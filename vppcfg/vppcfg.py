@@ -19,61 +19,34 @@ config files. See http://github.com/pimvanpelt/vppcfg/README.md for details. """
 import os
 import sys
 import logging
-import yaml
 
 # Ensure the paths are correct when we execute from the source tree
-try:
-    from vppcfg.config import Validator
-except ModuleNotFoundError:
+if not __package__:
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from vppcfg.config import Validator
-from vppcfg.vpp.reconciler import Reconciler
-from vppcfg.vpp.dumper import Dumper
+    if __name__ != "__main__":
+        # We were imported as a bare top-level module: the source tree's
+        # vppcfg.py is shadowing the vppcfg package. Refuse the import, so
+        # that callers with a fallback (like tests.py) retry against the
+        # package now that sys.path points at it.
+        raise ModuleNotFoundError("vppcfg.py imported outside of its package")
 
 try:
     import argparse
 except ImportError:
     print("ERROR: install argparse manually: sudo pip install argparse")
-    sys.exit(-2)
+    sys.exit(2)
 
 
-def main():
-    """The main vppcfg program"""
-    parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
-    parser.add_argument(
-        "-d",
-        "--debug",
-        dest="debug",
-        action="store_true",
-        help="""enable debug logging, default False""",
-    )
+def add_check_args(parser):
+    """Add the arguments for the 'check' subcommand to the given parser"""
     parser.add_argument(
-        "-q",
-        "--quiet",
-        dest="quiet",
-        action="store_true",
-        help="""be quiet (only warnings/errors), default False""",
-    )
-    parser.add_argument(
-        "-f",
-        "--force",
-        dest="force",
-        action="store_true",
-        help="""force progress despite warnings, default False""",
-    )
-
-    subparsers = parser.add_subparsers(dest="command")
-    check_p = subparsers.add_parser(
-        "check", help="check given YAML config for validity (no VPP)"
-    )
-    check_p.add_argument(
         "-s",
         "--schema",
         dest="schema",
         type=str,
         help="""YAML schema validation file, default to use built-in""",
     )
-    check_p.add_argument(
+    parser.add_argument(
         "-c",
         "--config",
         dest="config",
@@ -82,10 +55,10 @@ def main():
         help="""YAML configuration file for vppcfg""",
     )
 
-    dump_p = subparsers.add_parser(
-        "dump", help="dump current running VPP configuration (VPP readonly)"
-    )
-    dump_p.add_argument(
+
+def add_dump_args(parser):
+    """Add the arguments for the 'dump' subcommand to the given parser"""
+    parser.add_argument(
         "-o",
         "--output",
         dest="outfile",
@@ -94,7 +67,7 @@ def main():
         type=str,
         help="""Output file for YAML config, default stdout""",
     )
-    dump_p.add_argument(
+    parser.add_argument(
         "-j",
         "--vpp-json-dir",
         dest="vpp_json_dir",
@@ -102,7 +75,7 @@ def main():
         type=str,
         help="""Directory where VPP API JSON files are located""",
     )
-    dump_p.add_argument(
+    parser.add_argument(
         "-a",
         "--vpp-api-socket",
         dest="vpp_api_socket",
@@ -111,18 +84,17 @@ def main():
         help="""Pathname of VPP API socket file""",
     )
 
-    plan_p = subparsers.add_parser(
-        "plan",
-        help="plan changes from current VPP dataplane to target config (VPP readonly)",
-    )
-    plan_p.add_argument(
+
+def add_plan_args(parser):
+    """Add the arguments for the 'plan' subcommand to the given parser"""
+    parser.add_argument(
         "-s",
         "--schema",
         dest="schema",
         type=str,
         help="""YAML schema validation file, default to use built-in""",
     )
-    plan_p.add_argument(
+    parser.add_argument(
         "-c",
         "--config",
         dest="config",
@@ -130,13 +102,13 @@ def main():
         type=str,
         help="""YAML configuration file for vppcfg""",
     )
-    plan_p.add_argument(
+    parser.add_argument(
         "--novpp",
         dest="novpp",
         action="store_true",
         help="""Don't query VPP API, assume 'empty' dataplane config""",
     )
-    plan_p.add_argument(
+    parser.add_argument(
         "-o",
         "--output",
         dest="outfile",
@@ -145,7 +117,7 @@ def main():
         type=str,
         help="""Output file for VPP CLI commands, default stdout""",
     )
-    plan_p.add_argument(
+    parser.add_argument(
         "-j",
         "--vpp-json-dir",
         dest="vpp_json_dir",
@@ -153,7 +125,7 @@ def main():
         type=str,
         help="""Directory where VPP API JSON files are located""",
     )
-    plan_p.add_argument(
+    parser.add_argument(
         "-a",
         "--vpp-api-socket",
         dest="vpp_api_socket",
@@ -162,17 +134,17 @@ def main():
         help="""Pathname of VPP API socket file""",
     )
 
-    apply_p = subparsers.add_parser(
-        "apply", help="apply changes from current VPP dataplane to target config"
-    )
-    apply_p.add_argument(
+
+def add_apply_args(parser):
+    """Add the arguments for the 'apply' subcommand to the given parser"""
+    parser.add_argument(
         "-s",
         "--schema",
         dest="schema",
         type=str,
         help="""YAML schema validation file, default to use built-in""",
     )
-    apply_p.add_argument(
+    parser.add_argument(
         "-c",
         "--config",
         dest="config",
@@ -180,7 +152,7 @@ def main():
         type=str,
         help="""YAML configuration file for vppcfg""",
     )
-    apply_p.add_argument(
+    parser.add_argument(
         "-j",
         "--vpp-json-dir",
         dest="vpp_json_dir",
@@ -188,7 +160,7 @@ def main():
         type=str,
         help="""Directory where VPP API JSON files are located""",
     )
-    apply_p.add_argument(
+    parser.add_argument(
         "-a",
         "--vpp-api-socket",
         dest="vpp_api_socket",
@@ -197,6 +169,79 @@ def main():
         help="""Pathname of VPP API socket file""",
     )
 
+
+def add_serve_args(parser):
+    """Add the arguments for the 'serve' subcommand to the given parser"""
+    parser.add_argument(
+        "--socket",
+        dest="socket",
+        required=False,
+        default="/run/vppcfg.sock",
+        type=str,
+        help="""Unix domain socket path for the vppcfg daemon, default /run/vppcfg.sock""",
+    )
+
+
+## Subcommand name to (argument builder, help text). The builder for a
+## subcommand is only invoked when that subcommand is actually given on the
+## command line (or for --help, when all of them are built).
+SUBCOMMANDS = {
+    "check": (add_check_args, "check given YAML config for validity (no VPP)"),
+    "dump": (add_dump_args, "dump current running VPP configuration (VPP readonly)"),
+    "plan": (
+        add_plan_args,
+        "plan changes from current VPP dataplane to target config (VPP readonly)",
+    ),
+    "apply": (
+        add_apply_args,
+        "apply changes from current VPP dataplane to target config",
+    ),
+    "serve": (
+        add_serve_args,
+        "run vppcfg as a persistent daemon on a Unix domain socket",
+    ),
+}
+
+
+def main():
+    """The main vppcfg program"""
+    parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        "-d",
+        "--debug",
+        dest="debug",
+        action="store_true",
+        help="""enable debug logging, default False""",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        dest="quiet",
+        action="store_true",
+        help="""be quiet (only warnings/errors), default False""",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        dest="force",
+        action="store_true",
+        help="""force progress despite warnings, default False""",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    ## Building the full argparse tree is a measurable part of startup, so
+    ## only construct the subparser for the subcommand that was actually
+    ## given. If there is no (valid) subcommand, construct all of them so
+    ## that help and error output are complete.
+    command = next((arg for arg in sys.argv[1:] if not arg.startswith("-")), None)
+    if command in SUBCOMMANDS:
+        add_args, helptext = SUBCOMMANDS[command]
+        add_args(subparsers.add_parser(command, help=helptext))
+    else:
+        for name, (add_args, helptext) in SUBCOMMANDS.items():
+            add_args(subparsers.add_parser(name, help=helptext))
+
     args = parser.parse_args()
     if not args.command:
         parser.print_help()
@@ -208,91 +253,128 @@ def main():
         level = logging.DEBUG
     if args.quiet:
         level = logging.WARNING
-    logging.basicConfig(
-        format="[%(levelname)-8s] %(name)s.%(funcName)s: %(message)s", level=level
-    )
+    ## %(funcName)s makes the logging module walk the stack for every record,
+    ## so only pay for it when debugging. Likewise, stop the logger from
+    ## collecting thread and process data that the format never uses.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    if args.debug:
+        log_format = "[%(levelname)-8s] %(name)s.%(funcName)s: %(message)s"
+    else:
+        log_format = "[%(levelname)-8s] %(name)s: %(message)s"
+    ## force=True replaces any handlers already on the root logger: a request
+    ## forked off the serve daemon re-enters main() in a process that already
+    ## configured logging, and the client's -d/-q must still take effect.
+    logging.basicConfig(format=log_format, level=level, force=True)
 
     opt_kwargs = {}
-    if "vpp_json_dir" in args and args.vpp_json_dir is not None:
-        opt_kwargs["vpp_json_dir"] = args.vpp_json_dir
-    if "vpp_api_socket" in args and args.vpp_api_socket is not None:
-        opt_kwargs["vpp_api_socket"] = args.vpp_api_socket
+    vpp_json_dir = getattr(args, "vpp_json_dir", None)
+    if vpp_json_dir is not None:
+        opt_kwargs["vpp_json_dir"] = vpp_json_dir
+    vpp_api_socket = getattr(args, "vpp_api_socket", None)
+    if vpp_api_socket is not None:
+        opt_kwargs["vpp_api_socket"] = vpp_api_socket
+
+    ## Import the modules for the given subcommand only. Loading PyYAML,
+    ## yamale and the VPP API modules is a significant fraction of startup,
+    ## and no subcommand needs all of them.
+    # pylint: disable=import-outside-toplevel
+    if args.command == "serve":
+        from vppcfg.daemon import serve
+
+        sys.exit(serve(args.socket))
 
     if args.command == "dump":
+        from vppcfg.vpp.dumper import Dumper
+
         dumper = Dumper(**opt_kwargs)
         if not dumper.readconfig():
             logging.error("Could not retrieve config from VPP")
-            sys.exit(-7)
+            sys.exit(7)
         dumper.write(args.outfile)
         sys.exit(0)
 
+    import yaml
+
     try:
-        with open(args.config, "r", encoding="utf-8") as file:
-            logging.info(f"Loading configfile {args.config}")
-            cfg = yaml.load(file, Loader=yaml.FullLoader)
-            logging.debug(f"Config: {cfg}")
+        from yaml import CSafeLoader as YAMLLoader
+    except ImportError:
+        from yaml import SafeLoader as YAMLLoader
+
+    from vppcfg.config import Validator
+
+    try:
+        ## Slurp the file and hand libyaml one contiguous bytes buffer: it
+        ## detects the (UTF-8) encoding itself, and parsing from a buffer
+        ## avoids per-chunk read callbacks into Python file objects.
+        logging.info("Loading configfile %s", args.config)
+        with open(args.config, "rb") as file:
+            contents = file.read()
+        cfg = yaml.load(contents, Loader=YAMLLoader)
+        ## Stringifying the whole config is expensive, only do it if the
+        ## message will actually be emitted.
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Config: %s", cfg)
     except OSError as err:
-        logging.error(f"Couldn't read config from {args.config}: {err}")
-        sys.exit(-1)
+        logging.error("Couldn't read config from %s: %s", args.config, err)
+        sys.exit(1)
 
     validator = Validator(schema=args.schema)
     if not validator.valid_config(cfg):
         logging.error("Configuration is not valid, bailing")
-        sys.exit(-2)
+        sys.exit(2)
     logging.info("Configuration is valid")
     if args.command == "check":
         sys.exit(0)
 
+    ## Only plan/apply get here: 'check' never pays for importing the
+    ## reconciler and the VPP API modules behind it.
+    from vppcfg.vpp.reconciler import Reconciler
+
     reconciler = Reconciler(cfg, **opt_kwargs)
-    if args.novpp:
+    if getattr(args, "novpp", False):
         if not reconciler.vpp.mockconfig(cfg):
-            sys.exit(-7)
+            sys.exit(7)
     else:
         if not reconciler.vpp.readconfig():
-            sys.exit(-3)
+            sys.exit(3)
 
-        if not reconciler.phys_exist_in_vpp():
+        phys_in_vpp, phys_in_config, lcps_ok = reconciler.preflight()
+        if not phys_in_vpp:
             logging.error("Not all PHYs in the config exist in VPP")
-            sys.exit(-4)
+            sys.exit(4)
 
-        if not reconciler.phys_exist_in_config():
+        if not phys_in_config:
             logging.error("Not all PHYs in VPP exist in the config")
-            sys.exit(-5)
+            sys.exit(5)
 
-        if not reconciler.lcps_exist_with_lcp_enabled():
+        if not lcps_ok:
             logging.error(
                 "Linux Control Plane is needed, but linux-cp API is not available"
             )
-            sys.exit(-6)
+            sys.exit(6)
 
     failed = False
-    if not reconciler.prune():
-        if not args.force:
-            logging.error("Planning prune failure")
-            sys.exit(-10)
-        failed = True
-        logging.warning("Planning prune failure, continuing due to --force")
-
-    if not reconciler.create():
-        if not args.force:
-            logging.error("Planning create failure")
-            sys.exit(-20)
-        failed = True
-        logging.warning("Planning create failure, continuing due to --force")
-
-    if not reconciler.sync():
+    for phase, planfunc, exitcode in [
+        ("prune", reconciler.prune, 10),
+        ("create", reconciler.create, 20),
+        ("sync", reconciler.sync, 30),
+    ]:
+        if planfunc():
+            continue
         if not args.force:
-            logging.error("Planning sync failure")
-            sys.exit(-30)
+            logging.error("Planning %s failure", phase)
+            sys.exit(exitcode)
         failed = True
-        logging.warning("Planning sync failure, continuing due to --force")
+        logging.warning("Planning %s failure, continuing due to --force", phase)
 
     if args.command == "plan":
         reconciler.write(args.outfile, emit_ok=not failed)
 
     if failed:
         logging.error("Planning failed")
-        sys.exit(-40)
+        sys.exit(40)
 
     logging.info("Planning succeeded")
     if args.command == "plan":